@@ -0,0 +1,308 @@
+import io
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from b2sdk.v2 import B2Api, InMemoryAccountInfo
+
+try:
+    import orjson
+
+    def fast_json(obj):
+        """Сериализует объект в JSON-строку быстрее встроенного кодировщика."""
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_SERIALIZE_NUMPY,
+        ).decode()
+
+except ImportError:
+    import json as orjson  # type: ignore
+
+    def fast_json(obj):
+        """Сериализует объект в JSON-строку быстрее встроенного кодировщика."""
+        return orjson.dumps(obj, ensure_ascii=False, indent=2, default=str)
+
+st.set_page_config(page_title="Просмотр отчётов", layout="wide")
+
+
+@st.cache_resource
+def get_bucket():
+    info = InMemoryAccountInfo()
+    api = B2Api(info)
+    api.authorize_account(
+        "production",
+        st.secrets["B2_KEY_ID"],
+        st.secrets["B2_APPLICATION_KEY"],
+    )
+    return api.get_bucket_by_name(st.secrets["B2_BUCKET_NAME"])
+
+
+_bucket = get_bucket()
+
+
+def download_scan_from_b2(file_name):
+    """Скачивает отчёт из B2 и возвращает сырые байты JSON."""
+    buf = io.BytesIO()
+    _bucket.download_file_by_name(file_name).save(buf)
+    return buf.getvalue()
+
+
+def list_user_scans(username):
+    """Возвращает список файлов отчётов пользователя."""
+    user_files = []
+    suffix = f"_{username}.json"
+    for file_version, _folder in _bucket.ls(fetch_count=1000):
+        file_name = file_version.file_name
+        if not file_name.endswith(".json"):
+            continue
+        if file_name.endswith(suffix):
+            user_files.append(
+                {
+                    "file_name": file_name,
+                    "size": file_version.size,
+                    "upload_timestamp": file_version.upload_timestamp,
+                }
+            )
+    return user_files
+
+
+def files_table(user_files):
+    """Таблица файлов отчётов с векторным форматированием даты и размера."""
+    df = pd.DataFrame(user_files)
+    df["Дата загрузки"] = pd.to_datetime(df["upload_timestamp"], unit="ms").dt.strftime(
+        "%d.%m.%Y %H:%M:%S"
+    )
+    exp = np.clip(np.log2(df["size"].clip(lower=1)) // 10, 0, 4).astype(int)
+    units = np.array(["B", "KB", "MB", "GB", "TB"])
+    df["Размер"] = (df["size"] / 1024.0**exp).round(2).astype(str) + " " + units[exp]
+    return df.rename(columns={"file_name": "Файл"})[["Файл", "Размер", "Дата загрузки"]]
+
+
+def ensure_list(value):
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def df_from_list_of_dicts(items, default_columns=None, flat=False):
+    if not items:
+        return pd.DataFrame(columns=default_columns or [])
+    if flat:
+        return pd.DataFrame(items)
+    return pd.json_normalize(items)
+
+
+@st.cache_data(show_spinner=False)
+def _pid_index(processes_json):
+    """Индекс процессов по PID для O(1)-поиска вместо линейного прохода."""
+    return {int(p.get("PID", -1)): p for p in orjson.loads(processes_json)}
+
+
+@st.cache_data(show_spinner=False)
+def build_search_corpus(cache_key, _df):
+    """Готовит склеенную строку поиска по кадру; cache_key — (отчёт, раздел)."""
+    text_cols = _df.select_dtypes(include=["object", "string", "category"]).columns
+    src = _df[text_cols] if len(text_cols) else _df
+    # в pandas 3 astype(str) сохраняет NA, и join падает на пропусках
+    return src.astype(str).fillna("").agg(" \x1f ".join, axis=1).str.lower()
+
+
+def quick_filter_df(df, q, corpus=None):
+    """Фильтр по подстроке во всех колонках."""
+    if not q or df.empty:
+        return df
+    if corpus is None:
+        corpus = df.astype(str).fillna("").agg(" \x1f ".join, axis=1).str.lower()
+    corpus_arr = corpus.to_numpy(dtype="U", copy=False)
+    return df[np.char.find(corpus_arr, q.lower()) >= 0]
+
+
+@st.cache_data(show_spinner=False)
+def _flatten_archive(entries_json):
+    """Разворачивает дерево архива в параллельные списки заголовков и метаданных."""
+    labels = []
+    metas = []
+    stack = [(entry, 0) for entry in reversed(ensure_list(orjson.loads(entries_json)))]
+    while stack:
+        node, level = stack.pop()
+        icon = "📁" if node.get("Это папка") else "📄"
+        label = " " * level + f"{icon} {node.get('Имя', '?')}"
+        labels.append(label)
+        metas.append(
+            fast_json({k: v for k, v in node.items() if k not in ("Имя", "Вложенное")})
+        )
+        for child in reversed(ensure_list(node.get("Вложенное"))):
+            stack.append((child, level + 1))
+    return labels, metas
+
+
+def display_archive_tree(entries):
+    """Отображает содержимое архива в виде дерева."""
+    labels, metas = _flatten_archive(orjson.dumps(ensure_list(entries)))
+    for label, meta_json in zip(labels, metas):
+        with st.expander(label):
+            st.json(meta_json)
+
+
+def render_table_section(df, section_key):
+    """Таблица раздела: быстрый поиск, просмотр, детали выбранной строки."""
+    if len(df) < 5000:
+        # небольшие таблицы фильтрует сам st.dataframe на клиенте,
+        # серверный поиск только плодил бы рераны на каждое нажатие
+        filtered = df
+    else:
+        q = st.text_input("Быстрый поиск", key=f"q_{section_key}")
+        scan_file = st.session_state.get("scan_file")
+        memo_key = f"filter_memo_{section_key}"
+        memo = st.session_state.get(memo_key)
+        if memo is not None and memo[0] == (scan_file, q):
+            filtered = memo[1]
+        else:
+            corpus = build_search_corpus((scan_file, section_key), df)
+            filtered = quick_filter_df(df, q, corpus)
+            st.session_state[memo_key] = ((scan_file, q), filtered)
+    st.dataframe(filtered, use_container_width=True)
+    if len(filtered):
+        row_idx = st.number_input(
+            "Детали строки",
+            min_value=0,
+            max_value=len(filtered) - 1,
+            value=0,
+            key=f"row_{section_key}",
+        )
+        st.json(fast_json(filtered.iloc[int(row_idx)].to_dict()))
+    return filtered
+
+
+def _compact_dtypes(df):
+    """Переводит строковые колонки с малым числом уникальных значений в category."""
+    try:
+        text_cols = df.select_dtypes(include=["object", "str"]).columns
+    except TypeError:  # pandas<3 не принимает dtype "str"
+        text_cols = df.select_dtypes(include="object").columns
+    for col in text_cols:
+        try:
+            low_cardinality = df[col].nunique(dropna=True) < max(32, len(df) // 50)
+        except TypeError:  # в колонке нехэшируемые значения (списки и т.п.)
+            continue
+        if low_cardinality:
+            df[col] = df[col].astype("category")
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def build_scan_views(scan_json):
+    """Готовит списки и таблицы всех разделов один раз на загруженный отчёт."""
+    data = orjson.loads(scan_json)
+    drivers_loaded = ensure_list(data.get("Загруженные драйвера"))
+    drivers_dir_files = ensure_list(data.get("Файлы в папке drivers"))
+    driverquery = ensure_list(data.get("Driverquery"))
+    processes = ensure_list(data.get("Процессы"))
+
+    combined = (
+        [{**d, "Источник": "Загруженные"} for d in drivers_loaded]
+        + [{**d, "Источник": "Папка drivers"} for d in drivers_dir_files]
+        + [{**d, "Источник": "Driverquery"} for d in driverquery]
+    )
+
+    df_proc = df_from_list_of_dicts(processes, flat=True)
+    if "PID" in df_proc.columns:
+        df_proc["PID"] = pd.to_numeric(df_proc["PID"], errors="coerce", downcast="integer")
+
+    views = {
+        "df_drv": df_from_list_of_dicts(combined),
+        "processes_json": orjson.dumps(processes),
+        "df_proc": df_proc,
+        "df_brw": df_from_list_of_dicts(ensure_list(data.get("Браузеры"))),
+        "df_dl": df_from_list_of_dicts(ensure_list(data.get("Загрузки")), flat=True),
+        "df_desk": df_from_list_of_dicts(ensure_list(data.get("Рабочий стол")), flat=True),
+        "df_app": df_from_list_of_dicts(ensure_list(data.get("AppData")), flat=True),
+        "df_del": df_from_list_of_dicts(ensure_list(data.get("Удалённые файлы")), flat=True),
+        "archives": ensure_list(data.get("Архивы")),
+    }
+    for key, value in views.items():
+        if isinstance(value, pd.DataFrame):
+            # category сначала, затем arrow-строки для остальных колонок:
+            # convert_dtypes не трогает уже категоризованные
+            views[key] = _compact_dtypes(value).convert_dtypes(dtype_backend="pyarrow")
+    return views
+
+
+st.title("Просмотр отчётов сканирования")
+
+username = st.text_input("Имя пользователя")
+if not username:
+    st.stop()
+
+user_files = list_user_scans(username)
+if not user_files:
+    st.info("Отчёты не найдены.")
+    st.stop()
+
+st.dataframe(files_table(user_files), use_container_width=True)
+
+file_options_real = [f["file_name"] for f in user_files]
+selected_file = st.selectbox("Отчёт", file_options_real)
+
+if st.button("Загрузить отчёт") and st.session_state.get("scan_file") != selected_file:
+    st.session_state.scan_bytes = download_scan_from_b2(selected_file)
+    st.session_state.scan_file = selected_file
+
+scan_bytes = st.session_state.get("scan_bytes")
+if scan_bytes is None:
+    st.stop()
+st.caption(f"Загружен отчёт: {st.session_state.scan_file}")
+
+views = build_scan_views(scan_bytes)
+
+section = st.sidebar.radio(
+    "Раздел",
+    [
+        "Драйвера",
+        "Процессы",
+        "Браузеры",
+        "Загрузки",
+        "Рабочий стол",
+        "AppData",
+        "Удалённые файлы",
+        "Архивы",
+    ],
+)
+
+if section == "Драйвера":
+    render_table_section(views["df_drv"], "drivers")
+elif section == "Процессы":
+    filtered = render_table_section(views["df_proc"], "processes")
+    pids = (
+        filtered["PID"].dropna().unique().tolist() if "PID" in filtered.columns else []
+    )
+    if pids:
+        pid_choice = st.selectbox("PID для деталей", pids)
+        proc = _pid_index(views["processes_json"]).get(int(pid_choice))
+        if proc is not None:
+            st.json(fast_json(proc))
+elif section == "Браузеры":
+    render_table_section(views["df_brw"], "browsers")
+elif section == "Загрузки":
+    render_table_section(views["df_dl"], "downloads")
+elif section == "Рабочий стол":
+    render_table_section(views["df_desk"], "desktop")
+elif section == "AppData":
+    render_table_section(views["df_app"], "appdata")
+elif section == "Удалённые файлы":
+    render_table_section(views["df_del"], "deleted")
+elif section == "Архивы":
+    archives = views["archives"]
+    if not archives:
+        st.info("Архивы не найдены.")
+    else:
+        row_idx = st.number_input(
+            "Номер архива", min_value=0, max_value=len(archives) - 1, value=0
+        )
+        archive = archives[int(row_idx)]
+        st.subheader(archive.get("Имя", f"Архив {int(row_idx)}"))
+        display_archive_tree(archive.get("Содержание архива"))